@@ -1,10 +1,13 @@
 import os
 import tkinter as tk
-from PIL import Image, ImageTk, ImageEnhance, ImageOps, ImageDraw, ImageFont
+from PIL import Image, ImageTk
 from tkinter import Menu, messagebox, filedialog, Canvas, Button, simpledialog, colorchooser
-import random
-import numpy as np
-import cv2
+from stats import ImageStats
+from parallel import BandExecutor
+
+# Heavy or rarely used modules (numpy, PIL.ImageDraw, PIL.ImageFont)
+# are imported inside the methods that need them, so that they are only loaded
+# on first use and do not slow down the start of the application.
 
 
 class App:
@@ -12,12 +15,13 @@ class App:
     The main application class for the Modsen image editing app.
     """
 
-    def __init__(self, master=None):
+    def __init__(self, master=None, threads=None):
         """
         Initialize the application.
 
         Args:
             master (tk.Tk): The root Tkinter window.
+            threads (int): The number of threads for the image operations, the number of CPU cores by default.
         """
         self.list_of_images = []
         self.current_image_index = -1
@@ -26,6 +30,8 @@ class App:
         self.canvas = None
         self.master = master
         self.photo = None
+        self.stats = None
+        self.executor = BandExecutor(threads)
 
         self.master.title('Modsen')
         self.master.state('zoomed')
@@ -87,6 +93,14 @@ class App:
         self.add_text_button = Button(self.master, text="Add text", command=self.add_text_dialog)
         self.add_text_button.pack(side="left", padx=5)
 
+        # Create Auto Contrast Button
+        self.auto_contrast_button = Button(self.master, text="Auto Contrast", command=self.auto_contrast)
+        self.auto_contrast_button.pack(side="left", padx=5)
+
+        # Create Auto Levels Button
+        self.auto_levels_button = Button(self.master, text="Auto Levels", command=self.auto_levels)
+        self.auto_levels_button.pack(side="left", padx=5)
+
     def save_image(self):
         """
         Save the currently displayed image.
@@ -126,9 +140,13 @@ class App:
         file_path = filedialog.askopenfilename()
         if file_path:
             # Use PIL to open and display the image
-            image = Image.open(file_path)
+            # The image is kept as RGBA, the mode the image is read back from the PhotoImage
+            image = Image.open(file_path).convert('RGBA')
             #image = image.resize((800, 800))  # Resize the image to fit the GUI
 
+            # Compute the image statistics once, the operations keep them up to date
+            self.stats = ImageStats.from_image(image)
+
             # Create the PhotoImage with the correct dimensions
             self.photo = ImageTk.PhotoImage(image)
 
@@ -155,6 +173,7 @@ class App:
 
             # Resize the image using PIL
             scaled_image = pil_image.resize((int(pil_image.width * scale_factor), int(pil_image.height * scale_factor)))
+            self.stats = ImageStats.from_image(scaled_image)
 
             # Update the PhotoImage with the scaled image
             self.photo = ImageTk.PhotoImage(scaled_image)
@@ -176,6 +195,7 @@ class App:
 
             # Rotate the image using PIL
             rotated_image = pil_image.rotate(angle)
+            self.stats = ImageStats.from_image(rotated_image)
 
             # Update the PhotoImage with the rotated image
             self.photo = ImageTk.PhotoImage(rotated_image)
@@ -270,9 +290,11 @@ class App:
             # Get the PIL Image object from the PhotoImage
             pil_image = ImageTk.getimage(self.photo)
 
-            # Create an ImageEnhance object and apply brightness enhancement
-            enhancer = ImageEnhance.Brightness(pil_image)
-            enhanced_image = enhancer.enhance(brightness_factor)
+            # Apply the brightness change as a lookup table, so the statistics are mapped without reading the pixels
+            # The rows of the image are processed in parallel
+            luts = self.current_stats(pil_image).brightness_luts(brightness_factor)
+            enhanced_image = self.apply_luts(pil_image, luts)
+            self.stats = self.stats.apply_lut(luts)
 
             # Update the PhotoImage with the enhanced image
             self.photo = ImageTk.PhotoImage(enhanced_image)
@@ -333,6 +355,7 @@ class App:
 
             # Crop the image
             cropped_image = pil_image.crop((x, y, x + width, y + height))
+            self.stats = self.current_stats(pil_image).crop(pil_image, (x, y, x + width, y + height))
 
             # Update the PhotoImage with the cropped image
             self.photo = ImageTk.PhotoImage(cropped_image)
@@ -373,6 +396,8 @@ class App:
             # Get the PIL Image object from the PhotoImage
             pil_image = ImageTk.getimage(self.photo)
 
+            from PIL import ImageOps
+
             # Reflect the image
             if reflection_type == "horizontal":
                 reflected_image = ImageOps.mirror(pil_image)
@@ -423,25 +448,18 @@ class App:
             # Get the PIL Image object from the PhotoImage
             pil_image = ImageTk.getimage(self.photo)
 
+            import numpy as np
+
             # Convert the intensity to a float value between 0 and 1
-            # To see the better result use very low intensity, f.e. 0.001
+            # The noise of every color channel is up to this share of the full range, f.e. 0.1
             intensity = float(intensity)
 
-            # Calculate the maximum pixel value based on the image mode
-            max_pixel_value = 255 if pil_image.mode == "RGB" else 65535
-
-            # Loop through each pixel and add noise
-            for x in range(pil_image.width):
-                for y in range(pil_image.height):
-                    pixel = pil_image.getpixel((x, y))
+            # Add noise to the color channels, the alpha channel is kept
+            color_channels = len(pil_image.getbands()) - ('A' in pil_image.getbands())
+            pixels = self.executor.add_noise(np.asarray(pil_image), intensity, color_channels)
+            pil_image = Image.fromarray(pixels)
 
-                    # Generate random noise for each color channel
-                    noise = tuple(
-                        min(max(int(p + random.uniform(-intensity, intensity) * max_pixel_value), 0), max_pixel_value)
-                        for p in pixel
-                    )
-
-                    pil_image.putpixel((x, y), noise)
+            self.stats = ImageStats.from_image(pil_image)
 
             # Update the PhotoImage with the modified image
             self.photo = ImageTk.PhotoImage(pil_image)
@@ -490,11 +508,10 @@ class App:
             # Convert the contrast level to a float value
             level = float(level)
 
-            # Create an enhancer object for contrast adjustment
-            enhancer = ImageEnhance.Contrast(pil_image)
-
-            # Adjust the contrast
-            adjusted_image = enhancer.enhance(level)
+            # Adjust the contrast with a lookup table built around the mean grey level of the statistics
+            luts = self.current_stats(pil_image).contrast_luts(level)
+            adjusted_image = self.apply_luts(pil_image, luts)
+            self.stats = self.stats.apply_lut(luts)
 
             # Update the PhotoImage with the adjusted image
             self.photo = ImageTk.PhotoImage(adjusted_image)
@@ -552,12 +569,15 @@ class App:
                 # Crop size is larger than the image, do not perform cropping
                 return
 
+            import numpy as np
+
             # Generate random crop positions
             x = np.random.randint(0, max_x)
             y = np.random.randint(0, max_y)
 
             # Crop the image
             cropped_image = pil_image.crop((x, y, x + width, y + height))
+            self.stats = self.current_stats(pil_image).crop(pil_image, (x, y, x + width, y + height))
 
             # Update the PhotoImage with the cropped image
             self.photo = ImageTk.PhotoImage(cropped_image)
@@ -639,18 +659,98 @@ class App:
             size = int(size)
             color = self.text_color if hasattr(self, "text_color") else "black"
 
+            from PIL import ImageDraw, ImageFont
+
             # Create a PIL ImageDraw object
             draw = ImageDraw.Draw(pil_image)
 
             # Create a PIL ImageFont object with the specified font size
             font = ImageFont.truetype("arial.ttf", size)
 
-            # Draw the text on the image
+            # Draw the text on the image, the statistics are updated only for the area under the text
+            box = draw.textbbox((x, y), content, font=font)
+            left, upper = min(max(box[0], 0), pil_image.width), min(max(box[1], 0), pil_image.height)
+            box = (left, upper, max(min(box[2], pil_image.width), left), max(min(box[3], pil_image.height), upper))
+            stats = self.current_stats(pil_image)
+            old_region = pil_image.crop(box)
             draw.text((x, y), content, fill=color, font=font)
+            self.stats = stats.replace_region(old_region, pil_image.crop(box))
 
             # Update the PhotoImage with the modified image
             self.photo = ImageTk.PhotoImage(pil_image)
 
             # Configure the image_label with the updated PhotoImage
             self.image_label.configure(image=self.photo)
-            self.image_label.image = self.photo  # Keep a reference to the image to prevent garbage collection
\ No newline at end of file
+            self.image_label.image = self.photo  # Keep a reference to the image to prevent garbage collection
+
+    def current_stats(self, pil_image):
+        """
+        Get the statistics of the currently displayed image, computing them if they are missing.
+
+        Args:
+            pil_image (PIL.Image.Image): The currently displayed image.
+
+        Returns:
+            ImageStats: The statistics of the image.
+        """
+        if self.stats is None or self.stats.pixel_count != pil_image.width * pil_image.height:
+            self.stats = ImageStats.from_image(pil_image)
+        return self.stats
+
+    def apply_luts(self, pil_image, luts):
+        """
+        Map every channel of an image through its lookup table, processing the rows in parallel.
+
+        Args:
+            pil_image (PIL.Image.Image): The image to map.
+            luts (list): A lookup table of 256 values for every channel.
+
+        Returns:
+            PIL.Image.Image: The mapped image.
+        """
+        return self.executor.apply_lut(pil_image, luts)
+
+    def auto_contrast(self):
+        """
+        Stretch the contrast of the currently displayed image to the full range.
+
+        All the colour channels are stretched by the same amount, so the colours are kept.
+        The stretch is found from the cached histograms in O(256).
+        """
+        if self.photo:
+            # Get the PIL Image object from the PhotoImage
+            pil_image = ImageTk.getimage(self.photo)
+
+            # Build the lookup tables from the statistics and apply them
+            luts = self.current_stats(pil_image).auto_contrast_luts()
+            adjusted_image = self.apply_luts(pil_image, luts)
+            self.stats = self.stats.apply_lut(luts)
+
+            # Update the PhotoImage with the adjusted image
+            self.photo = ImageTk.PhotoImage(adjusted_image)
+
+            # Configure the image_label with the updated PhotoImage
+            self.image_label.configure(image=self.photo)
+            self.image_label.image = self.photo  # Keep a reference to the image to prevent garbage collection
+
+    def auto_levels(self):
+        """
+        Stretch every colour channel of the currently displayed image to the full range on its own.
+
+        This also removes a colour cast. The stretch is found from the cached histograms in O(256).
+        """
+        if self.photo:
+            # Get the PIL Image object from the PhotoImage
+            pil_image = ImageTk.getimage(self.photo)
+
+            # Build the lookup tables from the statistics and apply them
+            luts = self.current_stats(pil_image).auto_levels_luts()
+            adjusted_image = self.apply_luts(pil_image, luts)
+            self.stats = self.stats.apply_lut(luts)
+
+            # Update the PhotoImage with the adjusted image
+            self.photo = ImageTk.PhotoImage(adjusted_image)
+
+            # Configure the image_label with the updated PhotoImage
+            self.image_label.configure(image=self.photo)
+            self.image_label.image = self.photo  # Keep a reference to the image to prevent garbage collection
\ No newline at end of file
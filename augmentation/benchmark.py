@@ -0,0 +1,166 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+# Regression budget for the cold start of the application on thin clients
+IMPORT_BUDGET_MS = 150
+FIRST_WINDOW_BUDGET_MS = 500
+
+# Modules that must not be loaded when the application starts
+LAZY_MODULES = ('numpy', 'cv2', 'PIL.ImageEnhance', 'PIL.ImageOps', 'PIL.ImageDraw', 'PIL.ImageFont')
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Prints the loaded lazy modules as soon as the first window is drawn
+FIRST_WINDOW_SCRIPT = '''
+import sys
+from app import App, tk
+root = tk.Tk()
+app = App(root)
+root.update()
+print(",".join(name for name in {lazy!r} if name in sys.modules), flush=True)
+root.destroy()
+'''
+
+
+def check_returncode(args, returncode, stderr):
+    """
+    Print the error output of a failed benchmark run and raise.
+
+    Args:
+        args (list): The command of the run.
+        returncode (int): The exit status of the run.
+        stderr (str): The error output of the run.
+
+    Raises:
+        subprocess.CalledProcessError: If the run failed.
+    """
+    if returncode:
+        print(stderr, file=sys.stderr)
+        raise subprocess.CalledProcessError(returncode, args, stderr=stderr)
+
+
+def measure_import_time():
+    """
+    Measure the cumulative import time of the app module with `python -X importtime`.
+
+    Returns:
+        float: The cumulative import time of the app module in milliseconds.
+    """
+    args = [sys.executable, '-X', 'importtime', '-c', 'import app']
+    result = subprocess.run(args, cwd=APP_DIR, capture_output=True, text=True)
+    check_returncode(args, result.returncode, result.stderr)
+
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    for line in result.stderr.splitlines():
+        match = re.match(r'import time:\s+\d+\s+\|\s+(\d+)\s+\|\s+app$', line)
+        if match:
+            return int(match.group(1)) / 1000
+    raise RuntimeError('app module was not found in the importtime output')
+
+
+def measure_time_to_first_window():
+    """
+    Measure the time from launching the interpreter to the first drawn window.
+
+    The time is taken by this process, so the start of the interpreter is included.
+
+    Returns:
+        tuple: The time to the first window in milliseconds and the list of
+               lazy modules that were loaded during the start.
+    """
+    args = [sys.executable, '-c', FIRST_WINDOW_SCRIPT.format(lazy=LAZY_MODULES)]
+    start = time.perf_counter()
+    process = subprocess.Popen(args, cwd=APP_DIR, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    loaded = process.stdout.readline()
+    elapsed = (time.perf_counter() - start) * 1000
+    _, stderr = process.communicate()
+    check_returncode(args, process.returncode, stderr)
+    return elapsed, [name for name in loaded.strip().split(',') if name]
+
+
+def measure_band_scaling(megapixels=24, thread_counts=(1, 2, 4, 8, 16, 32), repeat=3):
+    """
+    Measure how the point-wise operations scale with the number of threads.
+
+    The lookup table is compared with single-threaded `Image.point`, the noise with its own run on one thread.
+
+    Args:
+        megapixels (float): The size of the test image in megapixels.
+        thread_counts (tuple): The numbers of threads to measure.
+        repeat (int): The number of runs of every operation, the best one is taken.
+
+    Returns:
+        dict: The best time in seconds of every operation for "baseline" and every number of threads.
+    """
+    import numpy as np
+    from PIL import Image
+    from parallel import BandExecutor
+
+    def best_time(operation):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            operation()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    side = int((megapixels * 1_000_000) ** 0.5)
+    src = np.random.default_rng(0).integers(0, 256, (side, side, 4), dtype=np.uint8)
+    image = Image.fromarray(src)
+    out = np.empty_like(src)
+    luts = [[min(int(value * 1.2), 255) for value in range(256)]] * 3 + [list(range(256))]
+
+    results = {
+        'lut': {'baseline': best_time(lambda: image.point(sum(luts, [])))},
+        'noise': {},
+    }
+    for threads in thread_counts:
+        executor = BandExecutor(threads)
+        results['lut'][threads] = best_time(lambda: executor.apply_lut(image, luts))
+        results['noise'][threads] = best_time(lambda: executor.add_noise(src, 0.1, seed=0, out=out))
+        executor.close()
+    results['noise']['baseline'] = results['noise'][thread_counts[0]]
+    return results
+
+
+def main():
+    """
+    Run the startup benchmark and check it against the regression budget.
+
+    With --parallel, measure the scaling of the point-wise operations instead.
+
+    Returns:
+        int: 0 if the startup fits into the budget, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the application')
+    parser.add_argument('--parallel', action='store_true', help='measure the scaling of the point-wise operations')
+    parser.add_argument('--megapixels', type=float, default=24, help='size of the test image for --parallel')
+    args = parser.parse_args()
+
+    if args.parallel:
+        for name, times in measure_band_scaling(args.megapixels).items():
+            baseline = times.pop('baseline')
+            print(f'{name}: baseline - {baseline * 1000:.1f} ms')
+            for threads, seconds in times.items():
+                print(f'{name}: {threads} threads - {seconds * 1000:.1f} ms, speedup {baseline / seconds:.2f}x')
+        return 0
+
+    import_time = measure_import_time()
+    first_window_time, loaded = measure_time_to_first_window()
+
+    print(f'Import time of app: {import_time:.1f} ms (budget {IMPORT_BUDGET_MS} ms)')
+    print(f'Time to first window: {first_window_time:.1f} ms (budget {FIRST_WINDOW_BUDGET_MS} ms)')
+    print(f'Lazy modules loaded on start: {", ".join(loaded) or "none"}')
+
+    if import_time > IMPORT_BUDGET_MS or first_window_time > FIRST_WINDOW_BUDGET_MS or loaded:
+        print('Startup is over the budget')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,12 @@
+import argparse
 from app import App, tk
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Modsen - Image Editing App')
+    parser.add_argument('--threads', type=int, help='number of threads for the image operations, all CPU cores by default')
+    args = parser.parse_args()
+
     root = tk.Tk()
-    app = App(root)
-    root.mainloop()
\ No newline at end of file
+    app = App(root, threads=args.threads)
+    root.mainloop()
@@ -0,0 +1,146 @@
+import os
+from PIL import Image
+
+# Images are split into bands of at least this many pixels, smaller images are processed in one band
+MIN_BAND_PIXELS = 512 * 1024
+
+
+def band_bounds(height, count):
+    """
+    Split the rows of an image into horizontal bands of nearly equal height.
+
+    Args:
+        height (int): The number of rows.
+        count (int): The number of bands.
+
+    Returns:
+        list: The (start, stop) rows of every band.
+    """
+    count = max(min(count, height), 1)
+    return [(height * i // count, height * (i + 1) // count) for i in range(count)]
+
+
+class BandExecutor:
+    """
+    Runs point-wise operations on horizontal bands of an image in a thread pool.
+
+    Lookup tables run Pillow's own kernels (crop, point, paste) on every band, and noise runs NumPy
+    kernels; all of them release the GIL, so the threads run truly in parallel. Every band writes
+    into its own rows of a preallocated output.
+    Images that fit into one band are processed with a single Pillow call, as without the executor.
+    """
+
+    def __init__(self, threads=None):
+        """
+        Initialize the executor.
+
+        Args:
+            threads (int): The number of threads, the number of CPU cores by default.
+        """
+        self.threads = threads or os.cpu_count() or 1
+        self._pool = None
+
+    def close(self):
+        """
+        Stop the threads.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def band_count(self, width, height):
+        """
+        Get the number of bands an image is split into.
+
+        Args:
+            width (int): The width of the image.
+            height (int): The height of the image.
+
+        Returns:
+            int: The number of bands, at most the number of threads.
+        """
+        return min(self.threads, max(width * height // MIN_BAND_PIXELS, 1), max(height, 1))
+
+    def map(self, func, width, height):
+        """
+        Run a function on every band of an image.
+
+        Args:
+            func (callable): Takes the band index, the start row and the stop row.
+            width (int): The width of the image.
+            height (int): The height of the image.
+        """
+        bounds = band_bounds(height, self.band_count(width, height))
+
+        if len(bounds) == 1:
+            func(0, *bounds[0])
+            return
+
+        if self._pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._pool = ThreadPoolExecutor(max_workers=self.threads)
+
+        # Wait for every band and raise the first error
+        for future in [self._pool.submit(func, index, start, stop) for index, (start, stop) in enumerate(bounds)]:
+            future.result()
+
+    def apply_lut(self, image, luts):
+        """
+        Map every channel of an image through its lookup table, like `Image.point`.
+
+        Args:
+            image (PIL.Image.Image): The image to map.
+            luts (list): A lookup table of 256 values for every channel.
+
+        Returns:
+            PIL.Image.Image: The mapped image.
+        """
+        table = [value for lut in luts for value in lut]
+        width, height = image.size
+        if self.band_count(width, height) == 1:
+            return image.point(table)
+
+        out = Image.new(image.mode, image.size)
+
+        def run(index, start, stop):
+            out.paste(image.crop((0, start, width, stop)).point(table), (0, start))
+
+        self.map(run, width, height)
+        return out
+
+    def add_noise(self, src, intensity, channels=3, seed=None, out=None):
+        """
+        Add uniform random noise to the colour channels of an image.
+
+        Every band draws its noise from its own generator, so the result for a given seed
+        does not depend on the timing of the threads.
+
+        Args:
+            src (numpy.ndarray): The uint8 image of shape (height, width, channels).
+            intensity (float): The maximum noise as a share of the full range, between 0 and 1.
+            channels (int): The number of leading channels to add the noise to, the others are copied.
+            seed (int): The seed of the noise, a random one by default.
+            out (numpy.ndarray): The preallocated output, a new array by default.
+
+        Returns:
+            numpy.ndarray: The noisy image.
+        """
+        import numpy as np
+
+        out = np.empty_like(src) if out is None else out
+        height, width = src.shape[:2]
+        seeds = np.random.SeedSequence(seed).spawn(self.band_count(width, height))
+        generators = [np.random.default_rng(child) for child in seeds]
+
+        def run(index, start, stop):
+            # float32 halves the temporary memory of a band compared to the default float64
+            noise = generators[index].random((stop - start, width, channels), dtype=np.float32)
+            noise *= 2 * intensity * 255
+            noise -= intensity * 255
+            noise += src[start:stop, :, :channels]
+            np.clip(noise, 0, 255, out=noise)
+            np.copyto(out[start:stop, :, :channels], noise, casting='unsafe')
+            np.copyto(out[start:stop, :, channels:], src[start:stop, :, channels:])
+
+        self.map(run, width, height)
+        return out
@@ -0,0 +1,247 @@
+class ImageStats:
+    """
+    Per-channel statistics of an 8-bit image, kept up to date while the image is edited.
+
+    The statistics are computed from the image once and then updated without looking at
+    the pixels where possible: point-wise operations map the histograms through their lookup
+    tables, and a crop only reads the smaller of the kept and the removed areas.
+    All the derived values (mean, variance, percentiles) cost O(256) per channel.
+    """
+
+    def __init__(self, bands, histograms):
+        """
+        Initialize the statistics.
+
+        Args:
+            bands (tuple): The band names, f.e. ("R", "G", "B", "A").
+            histograms (list): A list of 256 pixel counts for every band.
+        """
+        self.bands = tuple(bands)
+        self.histograms = [list(histogram) for histogram in histograms]
+
+    @classmethod
+    def from_image(cls, image):
+        """
+        Compute the statistics of an image.
+
+        Args:
+            image (PIL.Image.Image): An image with 8 bits per band.
+
+        Returns:
+            ImageStats: The statistics of the image.
+        """
+        bands = image.getbands()
+        return cls(bands, cls._split(image.histogram(), len(bands)))
+
+    @property
+    def pixel_count(self):
+        """
+        The number of pixels in the image.
+        """
+        return sum(self.histograms[0])
+
+    def mean(self, band):
+        """
+        Get the mean value of a band.
+
+        Args:
+            band (int): The band index.
+
+        Returns:
+            float: The mean value.
+        """
+        count = sum(self.histograms[band])
+        if not count:
+            return 0.0
+        return sum(value * n for value, n in enumerate(self.histograms[band])) / count
+
+    def variance(self, band):
+        """
+        Get the variance of a band.
+
+        Args:
+            band (int): The band index.
+
+        Returns:
+            float: The variance.
+        """
+        count = sum(self.histograms[band])
+        if not count:
+            return 0.0
+        mean = self.mean(band)
+        return sum(n * (value - mean) ** 2 for value, n in enumerate(self.histograms[band])) / count
+
+    def percentile(self, band, percent):
+        """
+        Get the lowest value that at least the given percent of the pixels do not exceed.
+
+        Args:
+            band (int): The band index, or None for all the colour bands together.
+            percent (float): The percentile between 0 and 100.
+
+        Returns:
+            int: The value between 0 and 255.
+        """
+        histogram = self.histograms[band] if band is not None else self._colour_histogram()
+        rank = percent / 100 * sum(histogram)
+        seen = 0
+        for value, n in enumerate(histogram):
+            seen += n
+            if n and seen >= rank:
+                return value
+        return 255
+
+    def apply_lut(self, luts):
+        """
+        Get the statistics after a point-wise operation without reading the pixels.
+
+        Args:
+            luts (list): A lookup table of 256 values for every band, as passed to `Image.point`.
+
+        Returns:
+            ImageStats: The statistics of the transformed image.
+        """
+        histograms = []
+        for histogram, lut in zip(self.histograms, luts):
+            mapped = [0] * 256
+            for value, n in enumerate(histogram):
+                mapped[lut[value]] += n
+            histograms.append(mapped)
+        return ImageStats(self.bands, histograms)
+
+    def crop(self, image, box):
+        """
+        Get the statistics after cropping, reading only the pixels of the smaller area.
+
+        If less than half of the image is kept the cropped area is counted, otherwise the
+        counts of the removed strips are subtracted from the current histograms.
+
+        Args:
+            image (PIL.Image.Image): The image before cropping, described by these statistics.
+            box (tuple): The crop box (left, upper, right, lower).
+
+        Returns:
+            ImageStats: The statistics of the cropped image.
+        """
+        left, upper, right, lower = box
+        width, height = image.size
+        inside = 0 <= left < right <= width and 0 <= upper < lower <= height
+        if not inside or 2 * (right - left) * (lower - upper) <= width * height:
+            return ImageStats.from_image(image.crop(box))
+
+        strips = [(0, 0, width, upper), (0, lower, width, height),
+                  (0, upper, left, lower), (right, upper, width, lower)]
+        stats = self
+        for strip in strips:
+            if strip[0] < strip[2] and strip[1] < strip[3]:
+                stats = stats.replace_region(image.crop(strip), None)
+        return stats
+
+    def replace_region(self, old_region, new_region):
+        """
+        Get the statistics after a region of the image has changed, reading only that region.
+
+        Args:
+            old_region (PIL.Image.Image): The region before the change.
+            new_region (PIL.Image.Image): The region after the change, or None if it was removed.
+
+        Returns:
+            ImageStats: The statistics of the changed image.
+        """
+        histograms = [list(histogram) for histogram in self.histograms]
+        old = self._split(old_region.histogram(), len(self.bands))
+        new = self._split(new_region.histogram(), len(self.bands)) if new_region is not None else None
+        for band, histogram in enumerate(histograms):
+            for value in range(256):
+                histogram[value] -= old[band][value]
+                if new is not None:
+                    histogram[value] += new[band][value]
+        return ImageStats(self.bands, histograms)
+
+    def brightness_luts(self, factor):
+        """
+        Build the lookup tables of a brightness change, like `ImageEnhance.Brightness`.
+
+        Args:
+            factor (float): The brightness factor, 1.0 keeps the image.
+
+        Returns:
+            list: The lookup tables for every band.
+        """
+        lut = [min(max(int(value * factor), 0), 255) for value in range(256)]
+        return [lut if self._is_colour(band) else list(range(256)) for band in range(len(self.bands))]
+
+    def contrast_luts(self, level):
+        """
+        Build the lookup tables of a contrast change, like `ImageEnhance.Contrast`.
+
+        The values are moved away from or towards the mean grey level, which is taken from
+        the histograms instead of converting the image to greyscale.
+
+        Args:
+            level (float): The contrast level, 1.0 keeps the image.
+
+        Returns:
+            list: The lookup tables for every band.
+        """
+        if all(band in self.bands for band in 'RGB'):
+            grey = sum(weight * self.mean(self.bands.index(band)) for band, weight in zip('RGB', (0.299, 0.587, 0.114)))
+        else:
+            grey = self.mean(0)
+        grey = int(grey + 0.5)
+        lut = [min(max(int(grey + level * (value - grey)), 0), 255) for value in range(256)]
+        return [lut if self._is_colour(band) else list(range(256)) for band in range(len(self.bands))]
+
+    def auto_contrast_luts(self, cutoff=0.5):
+        """
+        Build the lookup tables that stretch all the colour bands by the same amount.
+
+        The darkest and the brightest `cutoff` percent of the colour values are clipped,
+        so the hue of the image is kept.
+
+        Args:
+            cutoff (float): The percent of the values clipped at each end.
+
+        Returns:
+            list: The lookup tables for every band.
+        """
+        low = self.percentile(None, cutoff)
+        high = self.percentile(None, 100 - cutoff)
+        return [self._stretch_lut(low, high) if self._is_colour(band) else list(range(256))
+                for band in range(len(self.bands))]
+
+    def auto_levels_luts(self, cutoff=0.5):
+        """
+        Build the lookup tables that stretch every colour band to the full range on its own.
+
+        Args:
+            cutoff (float): The percent of the values clipped at each end of every band.
+
+        Returns:
+            list: The lookup tables for every band.
+        """
+        return [self._stretch_lut(self.percentile(band, cutoff), self.percentile(band, 100 - cutoff))
+                if self._is_colour(band) else list(range(256))
+                for band in range(len(self.bands))]
+
+    def _is_colour(self, band):
+        return self.bands[band] != 'A'
+
+    def _colour_histogram(self):
+        histogram = [0] * 256
+        for band, band_histogram in enumerate(self.histograms):
+            if self._is_colour(band):
+                for value, n in enumerate(band_histogram):
+                    histogram[value] += n
+        return histogram
+
+    @staticmethod
+    def _stretch_lut(low, high):
+        if high <= low:
+            return list(range(256))
+        scale = 255 / (high - low)
+        return [min(max(int((value - low) * scale + 0.5), 0), 255) for value in range(256)]
+
+    @staticmethod
+    def _split(histogram, band_count):
+        return [histogram[band * 256:(band + 1) * 256] for band in range(band_count)]
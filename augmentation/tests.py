@@ -1,10 +1,15 @@
 import unittest
 import os
+import subprocess
+import sys
 from unittest.mock import patch
 from tkinter import messagebox
 from tkinter import filedialog
-from PIL import Image
+from PIL import Image, ImageDraw
 from app import App, tk
+from parallel import BandExecutor, band_bounds
+from stats import ImageStats
+from benchmark import LAZY_MODULES, APP_DIR
 
 
 class TestApp(unittest.TestCase):
@@ -93,5 +98,105 @@ class TestApp(unittest.TestCase):
         self.assertTrue(mock_showinfo.called)
 
 
+class TestImageStats(unittest.TestCase):
+    def setUp(self):
+        # Create a test image with a gradient and a rectangle
+        self.image = Image.new('RGBA', (200, 100), color=(40, 80, 120, 255))
+        draw = ImageDraw.Draw(self.image)
+        for x in range(200):
+            draw.line((x, 0, x, 49), fill=(x, 255 - x, 100, 255))
+        draw.rectangle((20, 60, 70, 90), fill=(200, 10, 30, 255))
+        self.stats = ImageStats.from_image(self.image)
+
+    def test_statistics(self):
+        # Check if the mean and the percentiles of the red channel are computed from the histogram
+        red = list(self.image.getchannel('R').tobytes())
+        mean = sum(red) / len(red)
+        self.assertAlmostEqual(mean, self.stats.mean(0))
+        self.assertAlmostEqual(sum((value - mean) ** 2 for value in red) / len(red), self.stats.variance(0))
+        self.assertEqual(min(red), self.stats.percentile(0, 0))
+        self.assertEqual(max(red), self.stats.percentile(0, 100))
+
+    def test_point_operations_map_histograms(self):
+        for luts in (self.stats.brightness_luts(1.3), self.stats.contrast_luts(0.6),
+                     self.stats.auto_contrast_luts(), self.stats.auto_levels_luts()):
+            adjusted_image = self.image.point(sum(luts, []))
+
+            # Check if the mapped histograms match the histograms of the adjusted image
+            self.assertEqual(ImageStats.from_image(adjusted_image).histograms, self.stats.apply_lut(luts).histograms)
+
+    def test_crop(self):
+        for box in ((10, 10, 190, 95), (0, 0, 30, 30), (150, 50, 250, 120)):
+            # Check if the statistics after a crop match the cropped image
+            self.assertEqual(ImageStats.from_image(self.image.crop(box)).histograms,
+                             self.stats.crop(self.image, box).histograms)
+
+    def test_auto_levels_stretches_every_channel(self):
+        luts = self.stats.auto_levels_luts(cutoff=0)
+        stats = self.stats.apply_lut(luts)
+
+        # Check if every colour channel covers the full range and the alpha is kept
+        for band in range(3):
+            self.assertEqual(0, stats.percentile(band, 0))
+            self.assertEqual(255, stats.percentile(band, 100))
+        self.assertEqual(self.stats.histograms[3], stats.histograms[3])
+
+
+class TestBandExecutor(unittest.TestCase):
+    def setUp(self):
+        # Create a test image large enough to be split into several bands
+        self.image = Image.radial_gradient('L').resize((1100, 1000)).convert('RGBA')
+        self.executor = BandExecutor(threads=4)
+
+    def tearDown(self):
+        self.executor.close()
+
+    def test_band_bounds(self):
+        # Check if the bands cover every row once
+        bounds = band_bounds(1000, 3)
+        self.assertEqual([(0, 333), (333, 666), (666, 1000)], bounds)
+        self.assertEqual([(0, 2), (2, 5)], band_bounds(5, 2))
+        self.assertEqual([(0, 1)], band_bounds(1, 8))
+
+    def test_apply_lut(self):
+        import numpy as np
+        luts = [[255 - value for value in range(256)]] * 3 + [list(range(256))]
+
+        # Check if the bands match Image.point
+        self.assertGreater(self.executor.band_count(*self.image.size), 1)
+        result = self.executor.apply_lut(self.image, luts)
+        self.assertTrue((np.asarray(self.image.point(sum(luts, []))) == np.asarray(result)).all())
+
+    def test_single_band(self):
+        import numpy as np
+        executor = BandExecutor(threads=1)
+        luts = [[value // 2 for value in range(256)]] * 4
+
+        # Check if one thread gives the same result as Pillow alone
+        self.assertTrue((np.asarray(self.image.point(sum(luts, []))) ==
+                         np.asarray(executor.apply_lut(self.image, luts))).all())
+
+    def test_add_noise(self):
+        import numpy as np
+        pixels = np.asarray(self.image)
+        noisy = self.executor.add_noise(pixels, 0.1, seed=1)
+
+        # Check if the noise is bounded, repeatable for a seed and the alpha channel is kept
+        self.assertLessEqual(np.abs(noisy[..., :3].astype(int) - pixels[..., :3]).max(), 26)
+        self.assertTrue((noisy == self.executor.add_noise(pixels, 0.1, seed=1)).all())
+        self.assertTrue((noisy[..., 3] == pixels[..., 3]).all())
+
+
+class TestStartup(unittest.TestCase):
+    def test_heavy_modules_are_not_imported_on_start(self):
+        # Import the app in a clean interpreter and list the lazy modules it loaded
+        script = f"import sys, app; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+        result = subprocess.run([sys.executable, '-c', script], cwd=APP_DIR,
+                                capture_output=True, text=True, check=True)
+
+        # Check if none of the heavy modules were loaded
+        self.assertEqual('', result.stdout.strip())
+
+
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,202 @@
+import asyncio
+import math
+import time
+
+from probe import HttpProbe
+
+# Percentiles reported for every status code
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram:
+    """
+    A log-linear latency histogram in the style of HdrHistogram.
+
+    Values are recorded in microseconds into buckets whose width grows with the value,
+    so every recorded value is kept with the given number of significant figures
+    while the memory stays small for any range of values.
+    """
+
+    def __init__(self, significant_figures=3):
+        """
+        Initialize the histogram.
+
+        Args:
+            significant_figures (int): The number of significant decimal figures kept for every value.
+        """
+        self.significant_figures = significant_figures
+        self._sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_figures))
+        self._counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, seconds):
+        """
+        Record a latency.
+
+        Args:
+            seconds (float): The latency in seconds.
+        """
+        value = max(int(seconds * 1_000_000), 0)
+        shift = max(value.bit_length() - self._sub_bucket_bits, 0)
+        key = (shift, value >> shift)
+        self._counts[key] = self._counts.get(key, 0) + 1
+
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        """
+        Add the values recorded by another histogram with the same precision.
+
+        Args:
+            other (LatencyHistogram): The histogram to add.
+        """
+        for key, count in other._counts.items():
+            self._counts[key] = self._counts.get(key, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, percentile):
+        """
+        Get the latency at the given percentile.
+
+        Args:
+            percentile (float): The percentile between 0 and 100.
+
+        Returns:
+            int: The highest value equivalent to the bucket of the percentile, in microseconds.
+        """
+        if not self.count:
+            return 0
+        rank = max(math.ceil(percentile / 100 * self.count), 1)
+        seen = 0
+        for shift, sub_bucket in sorted(self._counts, key=lambda key: key[1] << key[0]):
+            seen += self._counts[(shift, sub_bucket)]
+            if seen >= rank:
+                return min(((sub_bucket + 1) << shift) - 1, self.max)
+        return self.max
+
+    def to_dict(self):
+        """
+        Summarize the histogram.
+
+        Returns:
+            dict: The count, min, max, mean and percentiles of the latency in milliseconds.
+        """
+        summary = {
+            'count': self.count,
+            'min_ms': (self.min or 0) / 1000,
+            'mean_ms': self.total / self.count / 1000 if self.count else 0,
+            'max_ms': (self.max or 0) / 1000,
+        }
+        for percentile in PERCENTILES:
+            summary[f'p{percentile:g}_ms'] = self.percentile(percentile) / 1000
+        return summary
+
+
+async def run_load(url, duration, rate=None, concurrency=10, keep_alive=True, method='GET'):
+    """
+    Send requests to an endpoint for a set duration and record the latencies per status code.
+
+    With `rate` the requests are started on a fixed schedule (open loop) and their latency
+    is measured from the scheduled start, so a slow server is not hidden by waiting requests.
+    Without `rate` a fixed number of workers send requests one after another (closed loop).
+
+    Args:
+        url (str): The URL to load.
+        duration (float): The duration of the load in seconds.
+        rate (float): The target number of requests per second, or None for a fixed concurrency.
+        concurrency (int): The number of workers, or the maximum number of requests in flight with `rate`.
+        keep_alive (bool): Reuse connections, otherwise open a new connection per request.
+        method (str): The HTTP method.
+
+    Returns:
+        dict: The results of the load, ready to be written as JSON.
+    """
+    histograms = {}
+    errors = {}
+
+    async def send(probe, scheduled):
+        try:
+            response = await probe.request(method, url)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as error:
+            name = type(error).__name__
+            errors[name] = errors.get(name, 0) + 1
+            return
+        histograms.setdefault(response.status, LatencyHistogram()).record(time.perf_counter() - scheduled)
+
+    async def worker(probe, deadline):
+        while time.perf_counter() < deadline:
+            await send(probe, time.perf_counter())
+
+    async with HttpProbe(limit=concurrency, keep_alive=keep_alive) as probe:
+        start = time.perf_counter()
+        deadline = start + duration
+
+        if rate:
+            tasks = set()
+            sent = 0
+            while True:
+                scheduled = start + sent / rate
+                if scheduled >= deadline:
+                    break
+                await asyncio.sleep(max(scheduled - time.perf_counter(), 0))
+                task = asyncio.ensure_future(send(probe, scheduled))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                sent += 1
+            await asyncio.gather(*tasks)
+        else:
+            await asyncio.gather(*(worker(probe, deadline) for _ in range(concurrency)))
+
+        elapsed = time.perf_counter() - start
+        connections = probe.pool.opened
+
+    requests = sum(histogram.count for histogram in histograms.values()) + sum(errors.values())
+    total = LatencyHistogram()
+    for histogram in histograms.values():
+        total.merge(histogram)
+
+    return {
+        'url': url,
+        'method': method,
+        'mode': 'rate' if rate else 'concurrency',
+        'rate': rate,
+        'concurrency': concurrency,
+        'keep_alive': keep_alive,
+        'duration_s': elapsed,
+        'requests': requests,
+        'achieved_rate': requests / elapsed if elapsed else 0,
+        'connections_opened': connections,
+        'latency': total.to_dict(),
+        'statuses': {str(status): histogram.to_dict() for status, histogram in sorted(histograms.items())},
+        'errors': errors,
+    }
+
+
+async def compare_connections(url, duration, rate=None, concurrency=10, method='GET'):
+    """
+    Run the same load with keep-alive connections and with a new connection per request.
+
+    Args:
+        url (str): The URL to load.
+        duration (float): The duration of every run in seconds.
+        rate (float): The target number of requests per second, or None for a fixed concurrency.
+        concurrency (int): The number of workers, or the maximum number of requests in flight with `rate`.
+        method (str): The HTTP method.
+
+    Returns:
+        dict: The results of both runs under "keep_alive" and "new_connection".
+    """
+    return {
+        'keep_alive': await run_load(url, duration, rate, concurrency, True, method),
+        'new_connection': await run_load(url, duration, rate, concurrency, False, method),
+    }
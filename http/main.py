@@ -1,25 +1,144 @@
-import requests
+import argparse
+import asyncio
 import json
 
-'''Не смог получить 100-ые и 500-ые статусы, так как 100-ые очень редкие и обычно не используются,
-   а 500-ые указывают на ошибку со стороны сервера и также редко встречаются'''
+from load import compare_connections, run_load
+from probe import HttpProbe
+from stub_server import StubServer
+
+'''Раньше не получалось получить 100-ые и 500-ые статусы, так как удалённые сервера их почти не отдают.
+   Теперь все статусы проверяются на локальном сервере-заглушке (stub_server.py), сеть для этого не нужна'''
 
 url_reqres = "https://reqres.in/api"
 
-request_ok = requests.request("GET",f'{url_reqres}/users?page=2')
-request_create = requests.request("POST",f'{url_reqres}/posts',
-                                    data = json.dumps({"title": "title", "body": "hand", "userId": 1}),
-                                    headers = {'Content-Type': 'application/json'})
-request_moved = requests.request('GET', url='http://github.com', allow_redirects=False)
-request_bad = requests.request('POST', f'{url_reqres}/register',
-                                        data=json.dumps({"email": "avangard@docs"}),
-                                        headers = {'Content-Type': 'application/json'})
-request_not_found = requests.request('GET', f'{url_reqres}/users/0')
-
-print(f'Successful Response - {request_ok.status_code}\n',
-      f'Successful Response - {request_create.status_code}\n',
-      f'Redirect Response - {request_moved.status_code}\n',
-      f'ErrorClient Response - {request_bad.status_code}\n',
-      f'ErrorClient Response - {request_not_found.status_code}\n'
-      )
+# Status codes checked on the local stand-in server, at least one for every class
+LOCAL_STATUSES = [100, 103, 200, 201, 204, 301, 302, 304, 400, 404, 418, 500, 502, 503]
+
+RESPONSE_CLASSES = {
+    1: 'Informational Response',
+    2: 'Successful Response',
+    3: 'Redirect Response',
+    4: 'ErrorClient Response',
+    5: 'ErrorServer Response',
+}
+
+
+def local_requests(base_url):
+    """
+    Build the requests to the local stand-in server.
+
+    Args:
+        base_url (str): The base URL of the stand-in server.
+
+    Returns:
+        list: Tuples of arguments for `HttpProbe.request`.
+    """
+    requests = []
+    for status in LOCAL_STATUSES:
+        if status == 100:
+            # 100 Continue is sent in answer to a request with "Expect: 100-continue"
+            requests.append(('POST', f'{base_url}/status/200', {'Content-Type': 'application/json'},
+                             json.dumps({"title": "title"}), True))
+        else:
+            requests.append(('GET', f'{base_url}/status/{status}'))
+    return requests
+
+
+def remote_requests():
+    """
+    Build the requests to reqres.in and github.com.
+
+    Returns:
+        list: Tuples of arguments for `HttpProbe.request`.
+    """
+    headers = {'Content-Type': 'application/json'}
+    return [
+        ('GET', f'{url_reqres}/users?page=2'),
+        ('POST', f'{url_reqres}/posts', headers, json.dumps({"title": "title", "body": "hand", "userId": 1})),
+        ('GET', 'http://github.com'),
+        ('POST', f'{url_reqres}/register', headers, json.dumps({"email": "avangard@docs"})),
+        ('GET', f'{url_reqres}/users/0'),
+    ]
+
+
+async def check_statuses(remote=False, limit=10):
+    """
+    Send the requests concurrently and collect the responses.
+
+    Args:
+        remote (bool): Check reqres.in and github.com instead of the local stand-in server.
+        limit (int): The maximum number of requests in flight.
+
+    Returns:
+        list: The received responses.
+    """
+    async with HttpProbe(limit) as probe:
+        if remote:
+            return await probe.run(remote_requests())
+        async with StubServer() as server:
+            return await probe.run(local_requests(server.url))
+
+
+def print_responses(responses):
+    """
+    Print the status codes of the responses, including the informational ones.
+
+    Args:
+        responses (list): The received responses.
+    """
+    for response in responses:
+        for status in response.interim + [response.status]:
+            print(f'{RESPONSE_CLASSES.get(status // 100, "Unknown Response")} - {status}')
+
+
+async def load_endpoint(url=None, duration=10.0, rate=None, concurrency=10, connections='keep-alive'):
+    """
+    Load an endpoint, or the local stand-in server if no URL is given.
+
+    Args:
+        url (str): The URL to load.
+        duration (float): The duration of the load in seconds.
+        rate (float): The target number of requests per second, or None for a fixed concurrency.
+        concurrency (int): The number of workers, or the maximum number of requests in flight with `rate`.
+        connections (str): "keep-alive", "new" for a new connection per request or "both" to compare them.
+
+    Returns:
+        dict: The results of the load.
+    """
+    if url is None:
+        async with StubServer() as server:
+            return await load_endpoint(f'{server.url}/status/200', duration, rate, concurrency, connections)
+
+    if connections == 'both':
+        return await compare_connections(url, duration, rate, concurrency)
+    return await run_load(url, duration, rate, concurrency, connections == 'keep-alive')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check the HTTP response statuses')
+    parser.add_argument('--remote', action='store_true', help='check reqres.in and github.com instead of the local server')
+    parser.add_argument('--limit', type=int, default=10, help='maximum number of concurrent requests')
+    parser.add_argument('--load', action='store_true', help='load an endpoint and record the latency histograms')
+    parser.add_argument('--url', help='endpoint to load, the local server by default')
+    parser.add_argument('--duration', type=float, default=10.0, help='duration of the load in seconds')
+    parser.add_argument('--rate', type=float, help='target requests per second, otherwise --limit workers are used')
+    parser.add_argument('--connections', choices=['keep-alive', 'new', 'both'], default='keep-alive',
+                        help='reuse connections, open a new one per request or compare both')
+    parser.add_argument('--output', help='file to write the load results to as JSON')
+    args = parser.parse_args()
+
+    if not args.load:
+        print_responses(asyncio.run(check_statuses(args.remote, args.limit)))
+        return
+
+    results = json.dumps(asyncio.run(load_endpoint(args.url, args.duration, args.rate, args.limit,
+                                                   args.connections)), indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(results)
+    else:
+        print(results)
+
 
+if __name__ == '__main__':
+    main()
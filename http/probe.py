@@ -0,0 +1,322 @@
+import asyncio
+import ssl
+import time
+from urllib.parse import urlsplit
+
+# Methods that can be sent again without changing the result on the server
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'PUT', 'DELETE', 'OPTIONS', 'TRACE')
+
+
+class StaleConnectionError(ConnectionError):
+    """
+    The connection failed before the server could have processed the request, so it is safe to send it again.
+
+    Raised if the request could not be written, or if an idempotent request got no byte of the response.
+    """
+
+
+class Response:
+    """
+    A response received by the probe.
+
+    Attributes:
+        status (int): The final status code.
+        reason (str): The reason phrase of the final status.
+        headers (dict): The final response headers with lower-case names.
+        body (bytes): The response body.
+        interim (list): The informational (1xx) status codes received before the final response.
+        elapsed (float): The time from sending the request to reading the whole response, in seconds.
+        reused (bool): Whether the request was sent over a pooled keep-alive connection.
+    """
+
+    def __init__(self, status, reason, headers, body, interim, elapsed, reused):
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.interim = interim
+        self.elapsed = elapsed
+        self.reused = reused
+
+    def __repr__(self):
+        return f'<Response [{self.status}]>'
+
+
+class ConnectionPool:
+    """
+    A pool of keep-alive connections grouped by scheme, host and port.
+    """
+
+    def __init__(self, keep_alive=True):
+        """
+        Initialize the pool.
+
+        Args:
+            keep_alive (bool): Keep connections open for the next requests.
+                               If False, every request opens a new connection.
+        """
+        self.keep_alive = keep_alive
+        self.opened = 0
+        self._idle = {}
+        self._ssl_context = None
+
+    async def acquire(self, scheme, host, port):
+        """
+        Get an idle connection to the given address or open a new one.
+
+        Args:
+            scheme (str): "http" or "https".
+            host (str): The host name.
+            port (int): The port number.
+
+        Returns:
+            tuple: The reader, the writer and whether the connection was reused.
+        """
+        idle = self._idle.get((scheme, host, port))
+        while idle:
+            reader, writer = idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+
+        ssl_context = None
+        if scheme == 'https':
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            ssl_context = self._ssl_context
+
+        reader, writer = await asyncio.open_connection(host, port, ssl=ssl_context)
+        self.opened += 1
+        return reader, writer, False
+
+    def release(self, scheme, host, port, reader, writer, reusable):
+        """
+        Return a connection to the pool or close it.
+
+        Args:
+            scheme (str): "http" or "https".
+            host (str): The host name.
+            port (int): The port number.
+            reader (asyncio.StreamReader): The reader of the connection.
+            writer (asyncio.StreamWriter): The writer of the connection.
+            reusable (bool): Whether the server allows to send another request over the connection.
+        """
+        if self.keep_alive and reusable:
+            self._idle.setdefault((scheme, host, port), []).append((reader, writer))
+        else:
+            writer.close()
+
+    async def close(self):
+        """
+        Close all idle connections.
+        """
+        writers = [writer for idle in self._idle.values() for _, writer in idle]
+        self._idle.clear()
+        for writer in writers:
+            writer.close()
+        for writer in writers:
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, ssl.SSLError):
+                pass
+
+
+class HttpProbe:
+    """
+    An asyncio HTTP/1.1 client that checks status codes concurrently over pooled connections.
+
+    Unlike most HTTP clients it reports the informational (1xx) responses, so that
+    "100 Continue" and "103 Early Hints" can be observed.
+    """
+
+    def __init__(self, limit=10, keep_alive=True, timeout=10.0):
+        """
+        Initialize the probe.
+
+        Args:
+            limit (int): The maximum number of requests in flight.
+            keep_alive (bool): Reuse connections between requests.
+            timeout (float): The timeout of a single request in seconds.
+        """
+        self.pool = ConnectionPool(keep_alive)
+        self.timeout = timeout
+        self.continue_timeout = 1.0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """
+        Close all pooled connections.
+        """
+        await self.pool.close()
+
+    async def request(self, method, url, headers=None, body=b'', expect_continue=False):
+        """
+        Send a request and read the response.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The absolute URL.
+            headers (dict): Additional request headers.
+            body (bytes or str): The request body.
+            expect_continue (bool): Send "Expect: 100-continue" and wait for the server before sending the body.
+
+        Returns:
+            Response: The received response. Redirects are not followed.
+        """
+        async with self._semaphore:
+            return await asyncio.wait_for(self._request(method, url, headers, body, expect_continue),
+                                          self.timeout)
+
+    async def run(self, requests):
+        """
+        Send the requests concurrently.
+
+        Args:
+            requests (list): Tuples of arguments for `request`, f.e. ("GET", url).
+
+        Returns:
+            list: The responses in the order of the requests.
+        """
+        return await asyncio.gather(*(self.request(*args) for args in requests))
+
+    async def _request(self, method, url, headers, body, expect_continue):
+        parts = urlsplit(url)
+        scheme = parts.scheme
+        host = parts.hostname
+        port = parts.port or (443 if scheme == 'https' else 80)
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+
+        if isinstance(body, str):
+            body = body.encode()
+
+        head = {'Host': parts.netloc, 'Content-Length': str(len(body))}
+        if not self.pool.keep_alive:
+            head['Connection'] = 'close'
+        if expect_continue:
+            head['Expect'] = '100-continue'
+        head.update(headers or {})
+        request_head = f'{method} {target} HTTP/1.1\r\n'
+        request_head += ''.join(f'{name}: {value}\r\n' for name, value in head.items()) + '\r\n'
+
+        # A pooled connection may have been closed by the server in the meantime, so a request
+        # over a reused connection is retried over another one. A written request that is not
+        # idempotent is never retried: the server may have processed it, f.e. a POST would repeat
+        while True:
+            reader, writer, reused = await self.pool.acquire(scheme, host, port)
+            start = time.perf_counter()
+            try:
+                response, reusable = await self._exchange(reader, writer, method, request_head.encode(),
+                                                          body, expect_continue)
+            except StaleConnectionError:
+                writer.close()
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+
+            response.elapsed = time.perf_counter() - start
+            response.reused = reused
+            self.pool.release(scheme, host, port, reader, writer, reusable)
+            return response
+
+    async def _exchange(self, reader, writer, method, request_head, body, expect_continue):
+        interim = []
+        body_sent = False
+
+        try:
+            if expect_continue and body:
+                writer.write(request_head)
+            else:
+                writer.write(request_head + body)
+                body_sent = True
+            await writer.drain()
+        except ConnectionError as error:
+            raise StaleConnectionError('Connection closed before the request was sent') from error
+
+        while True:
+            retry = not interim and method in IDEMPOTENT_METHODS
+            read_head = asyncio.ensure_future(self._read_head(reader, retry=retry))
+            try:
+                if not body_sent:
+                    # Servers that ignore the expectation never send 100, so the body is sent after a short wait
+                    done, _ = await asyncio.wait({read_head}, timeout=self.continue_timeout)
+                    if not done:
+                        writer.write(body)
+                        await writer.drain()
+                        body_sent = True
+                version, status, reason, headers = await read_head
+            finally:
+                read_head.cancel()
+
+            if 100 <= status < 200 and status != 101:
+                interim.append(status)
+                if status == 100 and not body_sent:
+                    writer.write(body)
+                    await writer.drain()
+                    body_sent = True
+                continue
+            break
+
+        reusable = body_sent and version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+
+        if method == 'HEAD' or status in (101, 204, 304):
+            payload = b''
+        elif headers.get('transfer-encoding', '').lower() == 'chunked':
+            payload = await self._read_chunked(reader)
+        elif 'content-length' in headers:
+            payload = await reader.readexactly(int(headers['content-length']))
+        else:
+            payload = await reader.read()
+            reusable = False
+
+        if status == 101:
+            reusable = False
+
+        return Response(status, reason, headers, payload, interim, 0.0, False), reusable
+
+    @staticmethod
+    async def _read_head(reader, retry=False):
+        try:
+            status_line = await reader.readline()
+        except ConnectionError as error:
+            if retry:
+                raise StaleConnectionError('Connection closed before the response') from error
+            raise
+        if not status_line:
+            if retry:
+                raise StaleConnectionError('Connection closed before the response')
+            raise ConnectionError('Connection closed by the server')
+        version, status, *reason = status_line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        return version, int(status), reason[0] if reason else '', headers
+
+    @staticmethod
+    async def _read_chunked(reader):
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            if size == 0:
+                # Skip the trailer headers
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                return b''.join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
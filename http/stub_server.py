@@ -0,0 +1,165 @@
+import asyncio
+import json
+import math
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+
+def reason_phrase(status):
+    """
+    Get the reason phrase of a status code.
+
+    Args:
+        status (int): The status code.
+
+    Returns:
+        str: The reason phrase, f.e. "Not Found".
+    """
+    if status == 103:
+        # HTTPStatus knows 103 only since Python 3.9
+        return 'Early Hints'
+    try:
+        return HTTPStatus(status).phrase
+    except ValueError:
+        return 'Unknown'
+
+
+class StubServer:
+    """
+    A local HTTP/1.1 stand-in server that answers with any status code on demand.
+
+    GET or POST /status/<code> is answered with the given code:
+        - 1xx (except 101) are sent as informational responses followed by a final 200,
+          103 Early Hints carries a Link header;
+        - 101 switches to a dummy protocol and closes the connection;
+        - 3xx redirect to /status/200;
+        - 204 and 304 have no body, the other codes have a small JSON body.
+    Requests with "Expect: 100-continue" get "100 Continue" before their body is read.
+    The query parameter "delay" holds the final response back for the given number of milliseconds,
+    a delay that is not a number is answered with 400.
+    Connections are kept alive unless the client sends "Connection: close".
+    """
+
+    def __init__(self, host='127.0.0.1', port=0):
+        """
+        Initialize the server.
+
+        Args:
+            host (str): The address to listen on.
+            port (int): The port to listen on, 0 picks a free port.
+        """
+        self.host = host
+        self.port = port
+        self.connections = 0
+        self._server = None
+
+    @property
+    def url(self):
+        """
+        The base URL of the server, f.e. "http://127.0.0.1:8080".
+        """
+        return f'http://{self.host}:{self.port}'
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def start(self):
+        """
+        Start listening for connections.
+        """
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """
+        Stop the server.
+        """
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while await self._handle_request(reader, writer):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_request(self, reader, writer):
+        request_line = await reader.readline()
+        if not request_line.strip():
+            return False
+        method, target, version = request_line.decode('latin-1').split()
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+
+        if headers.get('expect', '').lower() == '100-continue':
+            writer.write(b'HTTP/1.1 100 Continue\r\n\r\n')
+            await writer.drain()
+        await reader.readexactly(int(headers.get('content-length', 0)))
+
+        parts = urlsplit(target)
+        status = self._route(parts.path)
+        delay = parse_qs(parts.query).get('delay')
+        if delay:
+            try:
+                milliseconds = float(delay[0])
+            except ValueError:
+                milliseconds = math.nan
+            if math.isfinite(milliseconds):
+                await asyncio.sleep(max(milliseconds, 0) / 1000)
+            else:
+                # A delay that is not a finite number is the client's mistake
+                status = 400
+
+        if status == 101:
+            writer.write(b'HTTP/1.1 101 Switching Protocols\r\nUpgrade: stub\r\nConnection: Upgrade\r\n\r\n')
+            await writer.drain()
+            return False
+
+        if 100 <= status < 200:
+            interim = f'HTTP/1.1 {status} {reason_phrase(status)}\r\n'
+            if status == 103:
+                interim += 'Link: </style.css>; rel=preload; as=style\r\n'
+            writer.write((interim + '\r\n').encode())
+            status = 200
+
+        response_headers = {}
+        body = b''
+        if 300 <= status < 400 and status != 304:
+            response_headers['Location'] = '/status/200'
+        if status not in (204, 304):
+            body = json.dumps({'status': status, 'reason': reason_phrase(status)}).encode()
+            response_headers['Content-Type'] = 'application/json'
+            response_headers['Content-Length'] = str(len(body))
+        if not keep_alive:
+            response_headers['Connection'] = 'close'
+        if method == 'HEAD':
+            body = b''
+
+        head = f'HTTP/1.1 {status} {reason_phrase(status)}\r\n'
+        head += ''.join(f'{name}: {value}\r\n' for name, value in response_headers.items()) + '\r\n'
+        writer.write(head.encode() + body)
+        await writer.drain()
+        return keep_alive
+
+    @staticmethod
+    def _route(path):
+        parts = path.strip('/').split('/')
+        if len(parts) == 2 and parts[0] == 'status' and parts[1].isdigit() and 100 <= int(parts[1]) <= 599:
+            return int(parts[1])
+        return 404
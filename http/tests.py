@@ -0,0 +1,227 @@
+import asyncio
+import unittest
+from load import LatencyHistogram, compare_connections, run_load
+from probe import HttpProbe
+from stub_server import StubServer
+from main import LOCAL_STATUSES, local_requests
+
+
+class TestProbe(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # Start the local stand-in server
+        self.server = StubServer()
+        await self.server.start()
+
+    async def asyncTearDown(self):
+        # Stop the server
+        await self.server.close()
+
+    async def test_every_status_class(self):
+        async with HttpProbe(limit=4) as probe:
+            responses = await probe.run(local_requests(self.server.url))
+
+        # Check if every status was received, the informational ones before the final response
+        statuses = [status for response in responses for status in response.interim + [response.status]]
+        self.assertEqual(set(LOCAL_STATUSES), set(statuses))
+        self.assertEqual({1, 2, 3, 4, 5}, {status // 100 for status in statuses})
+
+    async def test_early_hints(self):
+        async with HttpProbe() as probe:
+            response = await probe.request('GET', f'{self.server.url}/status/103')
+
+        # Check if 103 was received before the final 200
+        self.assertEqual([103], response.interim)
+        self.assertEqual(200, response.status)
+
+    async def test_expect_continue(self):
+        async with HttpProbe() as probe:
+            response = await probe.request('POST', f'{self.server.url}/status/201', body=b'{}', expect_continue=True)
+
+        # Check if the body was sent after 100 Continue
+        self.assertEqual([100], response.interim)
+        self.assertEqual(201, response.status)
+
+    async def test_keep_alive_connections_are_reused(self):
+        async with HttpProbe(limit=2) as probe:
+            responses = await probe.run([('GET', f'{self.server.url}/status/200')] * 20)
+
+        # Check if the requests were sent over at most two pooled connections
+        self.assertTrue(all(response.status == 200 for response in responses))
+        self.assertLessEqual(probe.pool.opened, 2)
+        self.assertLessEqual(self.server.connections, 2)
+
+    async def test_new_connection_per_request(self):
+        async with HttpProbe(limit=2, keep_alive=False) as probe:
+            await probe.run([('GET', f'{self.server.url}/status/200')] * 5)
+
+        # Check if every request opened its own connection
+        self.assertEqual(5, probe.pool.opened)
+
+    async def test_switching_protocols_closes_connection(self):
+        async with HttpProbe() as probe:
+            switched = await probe.request('GET', f'{self.server.url}/status/101')
+            response = await probe.request('GET', f'{self.server.url}/status/200')
+
+        # Check if the switched connection was not reused
+        self.assertEqual(101, switched.status)
+        self.assertEqual(200, response.status)
+        self.assertFalse(response.reused)
+
+    async def test_stale_connection_is_retried(self):
+        requests = []
+
+        async def handle(reader, writer):
+            # Answer one request and close the connection without saying so
+            requests.append(await reader.readuntil(b'\r\n\r\n'))
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n')
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        url = f'http://127.0.0.1:{server.sockets[0].getsockname()[1]}/'
+        async with server, HttpProbe() as probe:
+            await probe.request('GET', url)
+            response = await probe.request('GET', url)
+
+        # Check if the second request was sent again over a new connection
+        self.assertEqual(200, response.status)
+        self.assertFalse(response.reused)
+        self.assertEqual(2, len(requests))
+
+    async def test_partial_response_is_not_retried(self):
+        requests = []
+
+        async def handle(reader, writer):
+            # Answer the first request, then break off the body of the second one
+            while True:
+                head = await reader.readuntil(b'\r\n\r\n')
+                await reader.readexactly(2)
+                requests.append(head)
+                if len(requests) == 1:
+                    writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n')
+                else:
+                    writer.write(b'HTTP/1.1 201 Created\r\nContent-Length: 10\r\n\r\n{}')
+                    await writer.drain()
+                    writer.close()
+                    return
+                await writer.drain()
+
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        url = f'http://127.0.0.1:{server.sockets[0].getsockname()[1]}/'
+        async with server, HttpProbe() as probe:
+            await probe.request('POST', url, body=b'{}')
+            with self.assertRaises(asyncio.IncompleteReadError):
+                await probe.request('POST', url, body=b'{}')
+
+        # Check if the POST was not sent twice
+        self.assertEqual(2, len(requests))
+
+    async def test_unanswered_post_is_not_retried(self):
+        requests = []
+
+        async def handle(reader, writer):
+            # Answer the first request, then read the second one and close without an answer
+            while True:
+                head = await reader.readuntil(b'\r\n\r\n')
+                await reader.readexactly(2)
+                requests.append(head.split(b' ', 1)[0])
+                if len(requests) > 1:
+                    writer.close()
+                    return
+                writer.write(b'HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n')
+                await writer.drain()
+
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        url = f'http://127.0.0.1:{server.sockets[0].getsockname()[1]}/'
+        async with server, HttpProbe() as probe:
+            await probe.request('POST', url, body=b'{}')
+            with self.assertRaises(ConnectionError):
+                await probe.request('POST', url, body=b'{}')
+
+        # Check if the processed POST was not sent again
+        self.assertEqual([b'POST', b'POST'], requests)
+
+    async def test_invalid_delay(self):
+        async with HttpProbe(timeout=2) as probe:
+            responses = await probe.run([('GET', f'{self.server.url}/status/200?delay={delay}')
+                                         for delay in ('soon', 'nan', 'inf', '-inf')])
+
+        # Check if the server answered with 400 instead of dropping or stalling the connection
+        self.assertEqual([400] * 4, [response.status for response in responses])
+
+    async def test_unknown_path(self):
+        async with HttpProbe() as probe:
+            response = await probe.request('GET', f'{self.server.url}/users')
+
+        # Check if the server answered with 404
+        self.assertEqual(404, response.status)
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles(self):
+        # Record the latencies from 1 to 1000 ms
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+
+        # Check if the percentiles are kept with three significant figures
+        summary = histogram.to_dict()
+        self.assertEqual(1000, summary['count'])
+        self.assertAlmostEqual(500, summary['p50_ms'], delta=0.5)
+        self.assertAlmostEqual(990, summary['p99_ms'], delta=1)
+        self.assertAlmostEqual(999, summary['p99.9_ms'], delta=1)
+        self.assertEqual(1000, summary['max_ms'])
+
+    def test_merge(self):
+        # Record the latencies into two histograms and merge them
+        fast, slow = LatencyHistogram(), LatencyHistogram()
+        for _ in range(90):
+            fast.record(0.001)
+        for _ in range(10):
+            slow.record(0.1)
+        fast.merge(slow)
+
+        # Check if the slow tail is visible after the merge
+        self.assertEqual(100, fast.count)
+        self.assertAlmostEqual(1, fast.percentile(90) / 1000, delta=0.01)
+        self.assertAlmostEqual(100, fast.percentile(99) / 1000, delta=0.1)
+
+
+class TestLoad(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # Start the local stand-in server
+        self.server = StubServer()
+        await self.server.start()
+
+    async def asyncTearDown(self):
+        # Stop the server
+        await self.server.close()
+
+    async def test_fixed_concurrency(self):
+        results = await run_load(f'{self.server.url}/status/503', duration=0.2, concurrency=4)
+
+        # Check if the latencies were recorded under the status code over the pooled connections
+        self.assertEqual('concurrency', results['mode'])
+        self.assertEqual(['503'], list(results['statuses']))
+        self.assertEqual(results['requests'], results['statuses']['503']['count'])
+        self.assertLessEqual(results['connections_opened'], 4)
+
+    async def test_target_rate(self):
+        results = await run_load(f'{self.server.url}/status/200?delay=5', duration=0.2, rate=100)
+
+        # Check if the requests were started on schedule and the delay is seen in the latency
+        self.assertEqual('rate', results['mode'])
+        self.assertEqual(20, results['requests'])
+        self.assertGreaterEqual(results['latency']['p50_ms'], 5)
+
+    async def test_compare_connections(self):
+        results = await compare_connections(f'{self.server.url}/status/200', duration=0.1, concurrency=2)
+
+        # Check if every request without keep-alive opened its own connection
+        new_connection = results['new_connection']
+        self.assertEqual(new_connection['requests'], new_connection['connections_opened'])
+        self.assertLessEqual(results['keep_alive']['connections_opened'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
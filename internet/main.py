@@ -1,38 +1,76 @@
-from selenium import webdriver
+from pool import DriverPool
+from state import empty_state, snapshot_state
+from static_server import StaticServer
 
-options = webdriver.ChromeOptions()
-driver = webdriver.Chrome(options=options)
-url = 'https://www.codewars.com/users/fekron'
-driver.get(url)
 
-# Set a value into ls
-driver.execute_script("localStorage.setItem('Key', 'Miracle');")
+def local_storage_scenario(driver, key='Key', value='Miracle'):
+    """
+    Set, get and delete a value in localStorage.
 
-# Getting the value from ls
-value = driver.execute_script("return localStorage.getItem('Key');")
-print(f"Value from localStorage: {value}")
+    Args:
+        driver (webdriver.Chrome): The browser to use.
+        key (str): The key of the value.
+        value (str): The value to set.
 
-# Delete the value from ls
-driver.execute_script("localStorage.removeItem('Key');")
+    Returns:
+        tuple: The value after setting and after deleting.
+    """
+    # Set a value into ls
+    driver.execute_script("localStorage.setItem(arguments[0], arguments[1]);", key, value)
 
-# Check if deleted
-value = driver.execute_script("return localStorage.getItem('Key');")
-print(f"Value after deleting: {value}")
+    # Getting the value from ls
+    stored = driver.execute_script("return localStorage.getItem(arguments[0]);", key)
 
-driver.get(url)
+    # Delete the value from ls
+    driver.execute_script("localStorage.removeItem(arguments[0]);", key)
 
-# Set a cookie
-driver.add_cookie({"name": "UnknownCookie", "value": "Known"})
+    # Check if deleted
+    deleted = driver.execute_script("return localStorage.getItem(arguments[0]);", key)
+    return stored, deleted
 
-# Getting the value of a cookie
-cookie = driver.get_cookie("UnknownCookie")
-print(f"Getting the value of a cookie: {cookie['value']}")
 
-# Delete the cookie
-driver.delete_cookie("UnknownCookie")
+def cookie_scenario(driver, name='UnknownCookie', value='Known'):
+    """
+    Set, get and delete a cookie.
 
-# Check if deleted
-cookie = driver.get_cookie("UnknownCookie")
-print(f"Cookie after deleting: {cookie}")
+    Args:
+        driver (webdriver.Chrome): The browser to use.
+        name (str): The name of the cookie.
+        value (str): The value to set.
 
-driver.quit()
\ No newline at end of file
+    Returns:
+        tuple: The value after setting and the cookie after deleting.
+    """
+    # Set a cookie
+    driver.add_cookie({"name": name, "value": value})
+
+    # Getting the value of a cookie
+    cookie = driver.get_cookie(name)
+
+    # Delete the cookie
+    driver.delete_cookie(name)
+
+    # Check if deleted
+    deleted = driver.get_cookie(name)
+    return cookie['value'], deleted
+
+
+if __name__ == '__main__':
+    with StaticServer() as server:
+        with DriverPool(server.url) as pool:
+            storage_results = pool.run([lambda driver, i=i: local_storage_scenario(driver, f'Key{i}') for i in range(8)])
+            cookie_results = pool.run([lambda driver, i=i: cookie_scenario(driver, f'Cookie{i}') for i in range(8)])
+
+        # Warm-start the browsers from a snapshot instead of replaying the per-key calls
+        snapshot = empty_state(server.url)
+        snapshot['localStorage'] = {'Key': 'Miracle'}
+        snapshot['cookies'] = [{'name': 'UnknownCookie', 'value': 'Known'}]
+        with DriverPool(server.url, snapshot=snapshot) as pool:
+            states = pool.run([snapshot_state] * 4)
+
+    for value, deleted in storage_results:
+        print(f"Value from localStorage: {value}, after deleting: {deleted}")
+    for value, deleted in cookie_results:
+        print(f"Getting the value of a cookie: {value}, after deleting: {deleted}")
+    for state in states:
+        print(f"State from snapshot: {state['localStorage']}, cookies: {[cookie['name'] for cookie in state['cookies']]}")
@@ -0,0 +1,179 @@
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from selenium import webdriver
+
+from state import empty_state, restore_state
+
+
+def headless_options():
+    """
+    Build the options of a headless Chrome.
+
+    Returns:
+        webdriver.ChromeOptions: The Chrome options.
+    """
+    options = webdriver.ChromeOptions()
+    options.add_argument('--headless=new')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--no-first-run')
+    return options
+
+
+class DriverPool:
+    """
+    A pool of warm headless Chrome instances that run storage and cookie scenarios in parallel.
+
+    Every browser is started once and opens the page once. Before every scenario its cookies,
+    localStorage and sessionStorage are restored from a snapshot instead of restarting the browser.
+    """
+
+    def __init__(self, url, size=4, options_factory=headless_options, snapshot=None):
+        """
+        Initialize the pool.
+
+        Args:
+            url (str): The page the scenarios run on.
+            size (int): The number of browser instances.
+            options_factory (callable): Builds the options of a new browser.
+            snapshot (dict): The state every scenario starts from, see `state.snapshot_state`.
+                             By default the scenarios start with no cookies and empty storages.
+        """
+        self.url = url
+        self.snapshot = snapshot or empty_state(url)
+        self.size = size
+        self.options_factory = options_factory
+        self._drivers = []
+        self._idle = queue.Queue()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def start(self):
+        """
+        Start the browsers in parallel and open the page in each of them.
+        """
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            futures = [executor.submit(self._start_driver) for _ in range(self.size)]
+
+        drivers = []
+        error = None
+        for future in futures:
+            try:
+                drivers.append(future.result())
+            except Exception as future_error:
+                error = error or future_error
+
+        # Do not leave the started browsers running if one of them failed
+        if error is not None:
+            for driver in drivers:
+                driver.quit()
+            raise error
+
+        for driver in drivers:
+            self._drivers.append(driver)
+            self._idle.put(driver)
+
+    def close(self):
+        """
+        Quit all browsers.
+        """
+        for driver in self._drivers:
+            driver.quit()
+        self._drivers.clear()
+
+        while True:
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+
+    @contextmanager
+    def driver(self):
+        """
+        Borrow a browser for one scenario and reset its state afterwards.
+
+        A browser that cannot be reset is replaced by a new one. If the replacement fails to start,
+        its slot stays in the pool and the next borrower starts the browser again, so the pool keeps
+        its size. If the scenario failed, its own error is raised rather than an error of the reset.
+
+        Yields:
+            webdriver.Chrome: A browser on the page of the pool.
+        """
+        driver = self._idle.get()
+        if driver is None:
+            driver = self._fill_slot()
+        try:
+            yield driver
+        except BaseException:
+            try:
+                self._release(driver)
+            except Exception:
+                pass
+            raise
+        else:
+            self._release(driver)
+
+    def reset(self, driver):
+        """
+        Restore the cookies and storages of a browser from the snapshot without restarting it.
+
+        Args:
+            driver (webdriver.Chrome): The browser to reset.
+        """
+        restore_state(driver, self.snapshot)
+
+    def run(self, scenarios):
+        """
+        Run the scenarios in parallel across the browsers.
+
+        Args:
+            scenarios (list): Callables that take a browser and return a result.
+
+        Returns:
+            list: The results in the order of the scenarios.
+        """
+        def run_scenario(scenario):
+            with self.driver() as driver:
+                return scenario(driver)
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return list(executor.map(run_scenario, scenarios))
+
+    def _release(self, driver):
+        try:
+            self.reset(driver)
+        except Exception:
+            self._drivers.remove(driver)
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            driver = self._fill_slot()
+        self._idle.put(driver)
+
+    def _fill_slot(self):
+        # Start a browser for an empty slot, on failure the empty slot (None) goes back to the pool
+        try:
+            driver = self._start_driver()
+        except BaseException:
+            self._idle.put(None)
+            raise
+        self._drivers.append(driver)
+        return driver
+
+    def _start_driver(self):
+        driver = webdriver.Chrome(options=self.options_factory())
+        try:
+            driver.get(self.url)
+            self.reset(driver)
+        except BaseException:
+            driver.quit()
+            raise
+        return driver
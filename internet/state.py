@@ -0,0 +1,133 @@
+import json
+from urllib.parse import urlsplit
+
+# Reads both storages of the current page in one round trip
+SNAPSHOT_SCRIPT = """
+const dump = (storage) => {
+    const items = {};
+    for (let i = 0; i < storage.length; i++) {
+        const key = storage.key(i);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+};
+return {url: location.href, localStorage: dump(localStorage), sessionStorage: dump(sessionStorage)};
+"""
+
+# Replaces both storages of the current page in one round trip,
+# returns false without changes if the page is not on the expected origin
+RESTORE_SCRIPT = """
+const [origin, local, session] = arguments;
+if (location.origin !== origin) return false;
+localStorage.clear();
+sessionStorage.clear();
+for (const [key, value] of Object.entries(local)) localStorage.setItem(key, value);
+for (const [key, value] of Object.entries(session)) sessionStorage.setItem(key, value);
+return true;
+"""
+
+# Cookie fields accepted by the Network.setCookies command
+COOKIE_FIELDS = ('name', 'value', 'url', 'domain', 'path', 'secure', 'httpOnly', 'sameSite', 'expires')
+
+
+def empty_state(url):
+    """
+    Build a snapshot of a page with no cookies and empty storages.
+
+    Args:
+        url (str): The page of the snapshot.
+
+    Returns:
+        dict: The empty snapshot.
+    """
+    return {'url': url, 'localStorage': {}, 'sessionStorage': {}, 'cookies': []}
+
+
+def snapshot_state(driver):
+    """
+    Capture localStorage, sessionStorage and all cookies of a browser.
+
+    Takes two round trips whatever the number of keys: one script for both storages
+    and one DevTools command for the cookies, including the HttpOnly ones.
+
+    Args:
+        driver (webdriver.Chrome): The browser to capture.
+
+    Returns:
+        dict: The snapshot with "url", "localStorage", "sessionStorage" and "cookies".
+    """
+    state = driver.execute_script(SNAPSHOT_SCRIPT)
+    state['cookies'] = driver.execute_cdp_cmd('Network.getAllCookies', {})['cookies']
+    return state
+
+
+def restore_state(driver, state):
+    """
+    Replace localStorage, sessionStorage and all cookies of a browser with a snapshot.
+
+    Takes three round trips whatever the number of keys, or five if the browser is on another origin:
+    the restore script itself checks the origin of the current page, and only if it differs the page
+    of the snapshot is opened and the script is run again.
+
+    Args:
+        driver (webdriver.Chrome): The browser to restore.
+        state (dict): The snapshot made by `snapshot_state`.
+    """
+    origin = _origin(state['url'])
+    if not driver.execute_script(RESTORE_SCRIPT, origin, state['localStorage'], state['sessionStorage']):
+        driver.get(state['url'])
+        driver.execute_script(RESTORE_SCRIPT, origin, state['localStorage'], state['sessionStorage'])
+
+    cookies = []
+    for cookie in state['cookies']:
+        cookie = {field: cookie[field] for field in COOKIE_FIELDS if field in cookie}
+        if 'domain' not in cookie and 'url' not in cookie:
+            cookie['url'] = state['url']
+        if cookie.get('expires', 0) < 0:
+            # Session cookies are reported with expires -1
+            del cookie['expires']
+        cookies.append(cookie)
+
+    driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+    if cookies:
+        driver.execute_cdp_cmd('Network.setCookies', {'cookies': cookies})
+
+
+def save_state(driver, path):
+    """
+    Capture the state of a browser into a JSON file.
+
+    Args:
+        driver (webdriver.Chrome): The browser to capture.
+        path (str): The file to write.
+
+    Returns:
+        dict: The saved snapshot.
+    """
+    state = snapshot_state(driver)
+    with open(path, 'w') as file:
+        json.dump(state, file, indent=2)
+    return state
+
+
+def load_state(driver, path):
+    """
+    Restore the state of a browser from a JSON file made by `save_state`.
+
+    Args:
+        driver (webdriver.Chrome): The browser to restore.
+        path (str): The file to read.
+
+    Returns:
+        dict: The restored snapshot.
+    """
+    with open(path) as file:
+        state = json.load(file)
+    restore_state(driver, state)
+    return state
+
+
+def _origin(url):
+    # The same form as location.origin in the browser, f.e. "http://127.0.0.1:8080"
+    parts = urlsplit(url)
+    return f'{parts.scheme}://{parts.netloc}'
@@ -0,0 +1,55 @@
+import os
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """
+    A static file handler that does not log every request.
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StaticServer:
+    """
+    A local HTTP server for the static pages, running in a background thread.
+    """
+
+    def __init__(self, directory=STATIC_DIR, host='127.0.0.1', port=0):
+        """
+        Initialize the server.
+
+        Args:
+            directory (str): The directory with the pages.
+            host (str): The address to listen on.
+            port (int): The port to listen on, 0 picks a free port.
+        """
+        self._server = ThreadingHTTPServer((host, port), partial(QuietHandler, directory=directory))
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        """
+        The URL of the index page, f.e. "http://127.0.0.1:8080/".
+        """
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Stop the server.
+        """
+        self._server.shutdown()
+        self._server.server_close()
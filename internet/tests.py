@@ -0,0 +1,177 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from urllib.request import urlopen
+from state import RESTORE_SCRIPT, load_state, restore_state, save_state, snapshot_state
+from static_server import StaticServer
+
+try:
+    import selenium
+except ImportError:
+    selenium = None
+
+# The browser tests need selenium and a Chrome to drive
+HAS_BROWSER = selenium is not None and any(
+    shutil.which(name) for name in ('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome'))
+
+if selenium is not None:
+    from pool import DriverPool
+if HAS_BROWSER:
+    from main import cookie_scenario, local_storage_scenario
+
+
+class FakeDriver:
+    """
+    A driver that counts the round trips instead of talking to a browser.
+    """
+
+    def __init__(self, url):
+        self._url = url
+        self.round_trips = 0
+
+    @property
+    def current_url(self):
+        self.round_trips += 1
+        return self._url
+
+    def get(self, url):
+        self.round_trips += 1
+        self._url = url
+
+    def execute_script(self, script, *args):
+        self.round_trips += 1
+        if script == RESTORE_SCRIPT:
+            return self._url.startswith(args[0] + '/')
+        return {'url': self._url, 'localStorage': {}, 'sessionStorage': {}}
+
+    def execute_cdp_cmd(self, command, params):
+        self.round_trips += 1
+        return {'cookies': []}
+
+    def quit(self):
+        pass
+
+
+class TestStaticServer(unittest.TestCase):
+    def test_index_page(self):
+        with StaticServer() as server:
+            with urlopen(server.url) as response:
+                page = response.read().decode()
+
+        # Check if the local page was served
+        self.assertIn('<title>Storage checks</title>', page)
+
+
+@unittest.skipUnless(HAS_BROWSER, 'selenium and Chrome are required')
+class TestDriverPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Start the local page and two warm browsers
+        cls.server = StaticServer().__enter__()
+        cls.pool = DriverPool(cls.server.url, size=2).__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+        cls.server.close()
+
+    def test_scenarios_in_parallel(self):
+        results = self.pool.run([local_storage_scenario, cookie_scenario] * 4)
+
+        # Check if every scenario set and deleted its value
+        self.assertEqual([('Miracle', None), ('Known', None)] * 4, results)
+
+    def test_state_is_reset_between_scenarios(self):
+        def leave_state(driver):
+            driver.execute_script("localStorage.setItem('Left', '1'); sessionStorage.setItem('Left', '1');")
+            driver.add_cookie({"name": "Left", "value": "1"})
+
+        def read_state(driver):
+            return (driver.execute_script("return localStorage.getItem('Left');"),
+                    driver.execute_script("return sessionStorage.getItem('Left');"),
+                    driver.get_cookie("Left"))
+
+        self.pool.run([leave_state] * 2)
+
+        # Check if the next scenarios do not see the state left by the previous ones
+        self.assertEqual([(None, None, None)] * 2, self.pool.run([read_state] * 2))
+
+    def test_snapshot_round_trip(self):
+        def fill_state(driver):
+            driver.execute_script("for (let i = 0; i < 100; i++) localStorage.setItem('Key' + i, String(i));"
+                                  "sessionStorage.setItem('Session', 'Value');")
+            driver.add_cookie({"name": "UnknownCookie", "value": "Known"})
+            save_state(driver, path)
+
+        def restored_state(driver):
+            load_state(driver, path)
+            return snapshot_state(driver)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'state.json')
+            self.pool.run([fill_state])
+            state = self.pool.run([restored_state])[0]
+
+        # Check if the storages and the cookie were restored in the clean browser
+        self.assertEqual({f'Key{i}': str(i) for i in range(100)}, state['localStorage'])
+        self.assertEqual({'Session': 'Value'}, state['sessionStorage'])
+        self.assertEqual(['Known'], [cookie['value'] for cookie in state['cookies']
+                                     if cookie['name'] == 'UnknownCookie'])
+
+
+@unittest.skipUnless(selenium is not None, 'selenium is required')
+class TestDriverPoolSlots(unittest.TestCase):
+    def test_failed_replacement_keeps_slot(self):
+        url = 'http://127.0.0.1:8000/'
+
+        def break_driver(driver):
+            # The next reset of this browser fails
+            driver.execute_cdp_cmd = mock.Mock(side_effect=RuntimeError('browser crashed'))
+
+        # The replacement of the broken browser fails to start, the next start succeeds
+        drivers = [FakeDriver(url), RuntimeError('no browser'), FakeDriver(url)]
+        with mock.patch('pool.webdriver.Chrome', side_effect=drivers):
+            with DriverPool(url, size=1, options_factory=lambda: None) as pool:
+                with self.assertRaises(RuntimeError):
+                    pool.run([break_driver])
+                results = pool.run([lambda driver: driver.current_url])
+
+                # Check if the empty slot was filled by the next scenario instead of hanging
+                self.assertEqual([url], results)
+                self.assertEqual(1, len(pool._drivers))
+
+
+class TestState(unittest.TestCase):
+    def setUp(self):
+        self.state = {
+            'url': 'http://127.0.0.1/',
+            'localStorage': {f'Key{i}': str(i) for i in range(1000)},
+            'sessionStorage': {'Session': 'Value'},
+            'cookies': [{'name': f'Cookie{i}', 'value': str(i)} for i in range(100)],
+        }
+
+    def test_round_trips_do_not_depend_on_keys(self):
+        driver = FakeDriver(self.state['url'])
+
+        restore_state(driver, self.state)
+        restored = driver.round_trips
+        snapshot_state(driver)
+
+        # Check if restoring took three round trips and capturing took two
+        self.assertEqual(3, restored)
+        self.assertEqual(5, driver.round_trips)
+
+    def test_restore_on_another_origin(self):
+        driver = FakeDriver('http://example.com/')
+
+        restore_state(driver, self.state)
+
+        # Check if the page was opened and the storages were restored after it
+        self.assertEqual('http://127.0.0.1/', driver._url)
+        self.assertEqual(5, driver.round_trips)
+
+
+if __name__ == '__main__':
+    unittest.main()